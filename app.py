@@ -6,83 +6,240 @@ Each option's share is determined by 1D Voronoi diagram logic
 (territory based on midpoints between adjacent positions).
 """
 
+import html
 import uuid
+from datetime import datetime
+from itertools import cycle
+from typing import Dict, Iterable, List, Optional, Tuple
 import streamlit as st
-import plotly.graph_objects as go
 from logic.vote_logic import VoteResult
-from logic.room_manager import get_room_manager
+from logic.room_manager import RoomManager, RoomState, get_room_manager
 
 
-def create_results_bar_chart(vote_result: VoteResult) -> go.Figure:
-    """Create a horizontal stacked bar chart showing vote shares with position markers."""
-    if not vote_result.shares:
-        return go.Figure()
+# Colors for the options
+_COLORS = ('#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#98D8C8')
+
+_PAGE_CONFIG = dict(
+    page_title="Vote Bar - Voronoi Voting",
+    page_icon="🎯",
+    layout="wide"
+)
+
+_DEFAULT_OPTIONS = ('Option A', 'Option B', 'Option C', 'Option D')
+
+_FAQ_HOWTO_MD = """
+### Voting Process:
+1. **Select options** by ticking them in the table
+2. **Set positions** in the Position column (0-100 scale)
+3. **Watch** the distribution update automatically above
+
+### How shares are calculated:
+- Each option controls territory based on **midpoints** between adjacent positions
+- This creates a **1D Voronoi diagram** on the 0-100 bar
+- Single option → gets 100%
+- Multiple options → territory boundaries at midpoints
+
+### Examples:
+- Two options at 30 and 70 → midpoint at 50 → 50% each
+- Three options at 20, 50, 80 → boundaries at 35 and 65 → 35%, 30%, 35%
+"""
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _compute_result(positions_items: Tuple[Tuple[str, float], ...]) -> VoteResult:
+    """Compute a VoteResult, cached on the (option, position) pairs in vote order.
     
-    # Get sorted results for consistent display
-    sorted_results = vote_result.get_sorted_results()
+    The order is part of the key on purpose: it decides which option wins a tied position.
+    """
+    return VoteResult(dict(positions_items))
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _build_bar_html(sorted_results: Tuple[Tuple[str, float, float], ...]) -> str:
+    """Render (option, position, share) rows sorted by position as a flexbox bar with position markers."""
+    segments = []
+    markers = []
+    for (option, position, share), color in zip(sorted_results, cycle(_COLORS)):
+        # Option names are user input, so escape them before they reach the page
+        label = html.escape(option)
+        segments.append(
+            f'<div style="flex:0 0 {share}%;background:{color};display:flex;align-items:center;'
+            f'justify-content:center;overflow:hidden;white-space:nowrap;font-size:0.8rem" '
+            f'title="{label}: position {position:.1f}, share {share:.1f}%">{label} {share:.1f}%</div>'
+        )
+        markers.append(
+            f'<div style="position:absolute;left:{position}%;top:50%;width:12px;height:12px;'
+            f'margin:-6px 0 0 -6px;box-sizing:border-box;border-radius:50%;background:white;'
+            f'border:3px solid {color}"></div>'
+        )
+    return (
+        '<div style="position:relative;display:flex;height:40px;border-radius:4px;overflow:hidden">'
+        + ''.join(segments) + ''.join(markers) + '</div>'
+    )
+
+
+def _option_keys(options: Iterable[str]) -> List[Tuple[str, str, str]]:
+    """Return (option, selection key, position key) triples, rebuilt only when the options change."""
+    signature = tuple(options)
+    if st.session_state.get('_option_keys_signature') != signature:
+        st.session_state._option_keys = [
+            (option, f"select_{option}", f"pos_{option}") for option in signature
+        ]
+        st.session_state._option_keys_signature = signature
+    return st.session_state._option_keys
+
+
+def _get_preview(positions: Dict[str, float]) -> Tuple[VoteResult, str]:
+    """Return the preview result and bar markup, reusing the last pair while positions are unchanged."""
+    # Keep the table order: sorting by name would change how tied positions split
+    signature = tuple(positions.items())
+    if st.session_state.get('_preview_signature') != signature:
+        vote_result = _compute_result(signature)
+        st.session_state._preview = (vote_result, _build_bar_html(tuple(vote_result.get_sorted_results())))
+        st.session_state._preview_signature = signature
+    return st.session_state._preview
+
+
+@st.cache_resource(show_spinner=False)
+def _get_room_manager() -> RoomManager:
+    """Share one room manager, and its database engine, across sessions and reruns."""
+    return get_room_manager()
+
+
+@st.cache_data(ttl=1.0, show_spinner=False)
+def _fetch_room(room_code: str) -> Optional[RoomState]:
+    """Fetch a room snapshot, shared by all reads within roughly one second."""
+    return _get_room_manager().get_room(room_code)
+
+
+def _sync_options(room_options: List[str]) -> None:
+    """Adopt the room's options, leaving session state untouched when they already match."""
+    if tuple(st.session_state.available_options) != tuple(room_options):
+        st.session_state.available_options = dict.fromkeys(room_options)
+
+
+def _reset_vote_editor() -> None:
+    """Reseed the vote editor from the select_/pos_ values on the next run."""
+    st.session_state.pop('_vote_editor', None)
+
+
+def _vote_editor_seed(option_keys: List[Tuple[str, str, str]]) -> Tuple[str, Dict[str, list]]:
+    """
+    Return the vote editor's widget key and seed data.
+    
+    The seed is part of the editor's identity, so it must not change while the user
+    edits: a new seed starts a fresh editor and drops the edit in flight. It is only
+    rebuilt after a reset (a vote restored or cleared) or when the options change,
+    each time under a new key so no earlier edits are replayed onto it.
+    """
+    editor = st.session_state.get('_vote_editor')
+    options = [option for option, _, _ in option_keys]
+    if editor is None or editor[1]['Option'] != options:
+        generation = st.session_state.get('_vote_editor_generation', 0) + 1
+        st.session_state._vote_editor_generation = generation
+        editor = (f"vote_editor_{generation}", {
+            'Include': [st.session_state.get(select_key, False) for _, select_key, _ in option_keys],
+            'Option': options,
+            'Position': [st.session_state.get(pos_key, 50.0) for _, _, pos_key in option_keys],
+        })
+        st.session_state._vote_editor = editor
+    return editor
+
+
+def _clear_vote_state(options: Iterable[str]) -> None:
+    """Drop the stored selection and position for each of the given options."""
+    for option in options:
+        st.session_state.pop(f"select_{option}", None)
+        st.session_state.pop(f"pos_{option}", None)
+    _reset_vote_editor()
+
+
+def _load_participant_vote(room: RoomState) -> None:
+    """Restore this participant's stored vote in the room, or start them with a clean slate."""
+    previous_vote = room.participant_votes.get(st.session_state.participant_id)
+    if previous_vote is not None:
+        for option, position in previous_vote.items():
+            st.session_state[f"select_{option}"] = True
+            st.session_state[f"pos_{option}"] = position
+        _reset_vote_editor()
+        st.session_state.vote_submitted = True
+    else:
+        # Clear all selections and positions for new voter
+        _clear_vote_state(room.available_options)
+        st.session_state.vote_submitted = False
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _aggregate_room(room_code: str, last_updated: datetime, participant_count: int) -> Dict[str, float]:
+    """Aggregate a room's votes in SQL; every vote bumps last_updated, so the key tracks changes."""
+    return _get_room_manager().get_aggregated_results(room_code)
+
+
+def _current_positions(option_keys: List[Tuple[str, str, str]]) -> Dict[str, float]:
+    """Collect the selected options' positions from session state, in table order."""
+    return {
+        option: st.session_state.get(pos_key, 50.0)
+        for option, select_key, pos_key in option_keys
+        if st.session_state.get(select_key, False)
+    }
+
+
+@st.fragment
+def _vote_editor_fragment(option_keys: List[Tuple[str, str, str]], had_selection: bool) -> None:
+    """Render the options table and live preview; table edits rerun only this fragment."""
+    # Edits are written back to select_/pos_ below but never reseed the editor
+    editor_key, editor_seed = _vote_editor_seed(option_keys)
+    edited = st.data_editor(
+        editor_seed,
+        column_config={
+            'Include': st.column_config.CheckboxColumn("Include"),
+            'Option': st.column_config.TextColumn("Option", disabled=True),
+            'Position': st.column_config.NumberColumn(
+                "Position (0-100)",
+                min_value=0.0,
+                max_value=100.0,
+                step=0.1,
+                format="%.1f",
+                required=True,
+                help="Set the option's position on the 0-100 bar"
+            ),
+        },
+        hide_index=True,
+        use_container_width=True,
+        key=editor_key
+    )
     
-    fig = go.Figure()
+    # Keep the per-option values in sync and collect the vote in one pass
+    current_positions = {}
+    for (option, select_key, pos_key), included, position in zip(
+        option_keys, edited['Include'], edited['Position']
+    ):
+        st.session_state[select_key] = bool(included)
+        st.session_state[pos_key] = float(position)
+        if included:
+            current_positions[option] = float(position)
+    
+    if bool(current_positions) != had_selection:
+        # The submit section outside this fragment appears or disappears with the selection
+        st.rerun()
+    
+    if not current_positions:
+        st.info("👆 Select at least one option above to continue")
+        return
     
-    # Colors for the options
-    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#98D8C8']
+    st.divider()
     
-    cumulative_width = 0
-    for i, (option, position, share) in enumerate(sorted_results):
-        color = colors[i % len(colors)]
-        
-        fig.add_trace(go.Bar(
-            y=['Vote Distribution'],
-            x=[share],
-            name=f"{option} ({share:.1f}%)",
-            orientation='h',
-            marker_color=color,
-            text=f"{option}<br>{share:.1f}%",
-            textposition='inside',
-            showlegend=True
-        ))
-        
-        cumulative_width += share
-    
-    # Add position markers as scatter points
-    for i, (option, position, share) in enumerate(sorted_results):
-        color = colors[i % len(colors)]
-        fig.add_trace(go.Scatter(
-            x=[position],
-            y=['Vote Distribution'],
-            mode='markers',
-            marker=dict(
-                size=12,
-                color='white',
-                line=dict(color=color, width=3),
-                symbol='circle'
-            ),
-            text=f"{option}: {position:.1f}",
-            textposition="top center",
-            showlegend=False,
-            hovertemplate=f"<b>{option}</b><br>Position: {position:.1f}<br>Share: {share:.1f}%<extra></extra>"
-        ))
-    
-    fig.update_layout(
-        barmode='stack',
-        xaxis_title="Position (0-100)",
-        yaxis=dict(visible=False),
-        height=120,
-        showlegend=True,
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        margin=dict(t=40, b=20, l=5, r=20),
-        xaxis=dict(range=[0, 100])
-    )
+    # SECTION 2: Live Preview
+    st.subheader("2. Preview")
     
-    return fig
+    # Plain HTML keeps the per-edit preview free of Plotly serialisation and rendering
+    _, bar_html = _get_preview(current_positions)
+    st.markdown(bar_html, unsafe_allow_html=True)
 
 
 def main():
     """Main Streamlit application."""
-    st.set_page_config(
-        page_title="Vote Bar - Voronoi Voting",
-        page_icon="🎯",
-        layout="wide"
-    )
+    st.set_page_config(**_PAGE_CONFIG)
     
     st.title("🎯 Vote Bar - Voronoi Voting System")
     st.markdown("""
@@ -91,7 +248,7 @@ def main():
     """)
     
     # Get room manager
-    room_manager = get_room_manager()
+    room_manager = _get_room_manager()
     
     # Initialize persistent participant ID
     # Try to get from query params first (persists across refreshes)
@@ -110,7 +267,13 @@ def main():
     if 'room_code' not in st.session_state:
         st.session_state.room_code = None
     if 'available_options' not in st.session_state:
-        st.session_state.available_options = ['Option A', 'Option B', 'Option C', 'Option D']
+        # Insertion-ordered dict (values unused) for O(1) membership checks
+        st.session_state.available_options = dict.fromkeys(_DEFAULT_OPTIONS)
+    # Bind the option dict once per rerun; in-place edits below still reach session state
+    options = st.session_state.available_options
+    
+    # Fetch the room once per rerun; the sidebar and results share this snapshot
+    room = _fetch_room(st.session_state.room_code) if st.session_state.room_code else None
     
     # Sidebar - Room Management
     st.sidebar.header("🏠 Room Management")
@@ -123,15 +286,11 @@ def main():
         
         with col1:
             if st.button("🆕 Create Room", use_container_width=True):
-                room_code = room_manager.create_room(st.session_state.available_options)
+                room_code = room_manager.create_room(list(options))
                 st.session_state.room_code = room_code
                 
-                # Clear all checkboxes and positions for new room
-                for option in st.session_state.available_options:
-                    if f"select_{option}" in st.session_state:
-                        del st.session_state[f"select_{option}"]
-                    if f"pos_{option}" in st.session_state:
-                        del st.session_state[f"pos_{option}"]
+                # Clear all selections and positions for new room
+                _clear_vote_state(options)
                 st.session_state.vote_submitted = False
                 
                 st.rerun()
@@ -152,25 +311,10 @@ def main():
                         room = room_manager.join_room(join_code)
                         if room:
                             st.session_state.room_code = join_code
-                            st.session_state.available_options = room.available_options.copy()
+                            _sync_options(room.available_options)
                             st.session_state.show_join_form = False
                             
-                            # Check if this participant has already voted in this room
-                            if st.session_state.participant_id in room.participant_votes:
-                                # Restore their previous vote
-                                previous_vote = room.participant_votes[st.session_state.participant_id]
-                                for option, position in previous_vote.items():
-                                    st.session_state[f"select_{option}"] = True
-                                    st.session_state[f"pos_{option}"] = position
-                                st.session_state.vote_submitted = True
-                            else:
-                                # Clear all checkboxes and positions for new voter
-                                for option in room.available_options:
-                                    if f"select_{option}" in st.session_state:
-                                        del st.session_state[f"select_{option}"]
-                                    if f"pos_{option}" in st.session_state:
-                                        del st.session_state[f"pos_{option}"]
-                                st.session_state.vote_submitted = False
+                            _load_participant_vote(room)
                             
                             st.rerun()
                         else:
@@ -183,8 +327,6 @@ def main():
     
     else:
         # In a room - show room info and leave option
-        room = room_manager.get_room(st.session_state.room_code)
-        
         if room:
             st.sidebar.success(f"🏠 **Room Code:**")
             
@@ -198,26 +340,12 @@ def main():
             
             with col1:
                 if st.button("🔄 Update", use_container_width=True, help="Refresh room state"):
-                    room = room_manager.get_room(st.session_state.room_code)
+                    _fetch_room.clear()
+                    room = _fetch_room(st.session_state.room_code)
                     if room:
-                        st.session_state.available_options = room.available_options.copy()
+                        _sync_options(room.available_options)
                         
-                        # Check if this participant has already voted in this room
-                        if st.session_state.participant_id in room.participant_votes:
-                            # Restore their previous vote
-                            previous_vote = room.participant_votes[st.session_state.participant_id]
-                            for option, position in previous_vote.items():
-                                st.session_state[f"select_{option}"] = True
-                                st.session_state[f"pos_{option}"] = position
-                            st.session_state.vote_submitted = True
-                        else:
-                            # Clear all checkboxes and positions for new voter
-                            for option in room.available_options:
-                                if f"select_{option}" in st.session_state:
-                                    del st.session_state[f"select_{option}"]
-                                if f"pos_{option}" in st.session_state:
-                                    del st.session_state[f"pos_{option}"]
-                            st.session_state.vote_submitted = False
+                        _load_participant_vote(room)
                         
                         st.rerun()
             
@@ -241,89 +369,57 @@ def main():
         submitted = st.form_submit_button("➕ Add Option")
         
         if submitted and new_option.strip():
-            if new_option.strip() not in st.session_state.available_options:
-                st.session_state.available_options.append(new_option.strip())
+            if new_option.strip() not in options:
+                options[new_option.strip()] = None
                 # Sync with room if in one
                 if st.session_state.room_code:
                     room_manager.update_room_options(
                         st.session_state.room_code,
-                        st.session_state.available_options
+                        list(options)
                     )
+                    _fetch_room.clear()
                 st.rerun()
             else:
                 st.warning("Option already exists!")
     
     # Display current options
     st.sidebar.subheader("Current Options:")
-    for i, option in enumerate(st.session_state.available_options):
+    for i, option in enumerate(tuple(options)):
         col1, col2 = st.sidebar.columns([3, 1])
         col1.write(f"{i+1}. {option}")
         if col2.button("🗑️", key=f"delete_{i}", help=f"Delete {option}"):
-            st.session_state.available_options.remove(option)
+            del options[option]
             # Sync with room if in one
             if st.session_state.room_code:
                 room_manager.update_room_options(
                     st.session_state.room_code,
-                    st.session_state.available_options
+                    list(options)
                 )
+                _fetch_room.clear()
             st.rerun()
     
     # Main voting interface
     st.header("🗳️ Cast Your Vote")
     
-    if not st.session_state.available_options:
+    if not options:
         st.warning("Please add some options in the sidebar first!")
         return
     
-    # SECTION 1: Option Selection (Checkboxes)
-    st.subheader("1. Select Options")
-    
-    # Display checkboxes in columns
-    checkbox_cols = st.columns(4)
-    for i, option in enumerate(st.session_state.available_options):
-        col = checkbox_cols[i % 4]
-        with col:
-            st.checkbox(f"**{option}**", key=f"select_{option}")
+    # SECTION 1: Options and positions (one table instead of a checkbox and slider per option)
+    st.subheader("1. Select Options and Set Positions")
     
-    # Collect selected options
-    selected_options = []
-    for option in st.session_state.available_options:
-        if st.session_state.get(f"select_{option}", False):
-            selected_options.append(option)
+    option_keys = _option_keys(options)
+    # Table edits rerun only the fragment; it reruns the whole app when the
+    # selection empties or fills, since that shows or hides the sections below
+    _vote_editor_fragment(option_keys, bool(_current_positions(option_keys)))
     
-    if not selected_options:
-        st.info("👆 Select at least one option above to continue")
+    # The fragment has written this run's edits back to session state
+    current_positions = _current_positions(option_keys)
+    if not current_positions:
         return
     
     st.divider()
     
-    # SECTION 2: Adjust Positions with Live Preview
-    st.subheader("2. Adjust Positions")
-    
-    # Collect current positions from sliders for preview
-    current_positions = {}
-    for option in selected_options:
-        current_positions[option] = st.session_state.get(f"pos_{option}", 50.0)
-    
-    # Live preview chart
-    vote_result = VoteResult(current_positions)
-    chart = create_results_bar_chart(vote_result)
-    st.plotly_chart(chart, use_container_width=True, key="preview_chart")
-    
-    # Position sliders (no divider for tight spacing)
-    for option in selected_options:
-        position = st.slider(
-            f"{option}:",
-            min_value=0.0,
-            max_value=100.0,
-            value=st.session_state.get(f"pos_{option}", 50.0),
-            step=0.1,
-            key=f"pos_{option}",
-            help=f"Set position for {option} on the 0-100 bar"
-        )
-    
-    st.divider()
-    
     # SECTION 3: Submit Vote
     st.subheader("3. Submit Your Vote")
     
@@ -331,12 +427,10 @@ def main():
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         if st.button("✅ Submit Vote", type="primary", use_container_width=True):
-            # Recalculate current positions at submit time
-            submit_positions = {}
-            for option in selected_options:
-                submit_positions[option] = st.session_state.get(f"pos_{option}", 50.0)
-            
-            # Generate participant ID if not exists
+            # Submit the positions the editor stored in session state
+            submit_positions = current_positions
+            # Immutable (option, position) snapshot of the submitted vote
+            vote_items = tuple(sorted(submit_positions.items()))
             
             # Save to room if in one
             if st.session_state.room_code:
@@ -346,14 +440,16 @@ def main():
                     submit_positions
                 )
                 if success:
+                    _fetch_room.clear()
+                    room = _fetch_room(st.session_state.room_code)
                     st.success("✅ Vote submitted successfully!")
-                    st.session_state.last_vote = submit_positions.copy()
+                    st.session_state.last_vote = vote_items
                     st.session_state.vote_submitted = True
                 else:
                     st.error("❌ Failed to submit vote. Room may no longer exist.")
             else:
                 st.success("✅ Vote recorded! (Solo mode - create/join room to share)")
-                st.session_state.last_vote = submit_positions.copy()
+                st.session_state.last_vote = vote_items
                 st.session_state.vote_submitted = True
     
     # Show submitted vote distribution
@@ -361,10 +457,9 @@ def main():
         st.divider()
         st.subheader("📊 Room Results")
         
-        room = room_manager.get_room(st.session_state.room_code)
         if room and room.participant_votes:
             # Get aggregated results
-            aggregated_points = room.get_aggregated_results()
+            aggregated_points = _aggregate_room(room.room_id, room.last_updated, room.participant_count)
             
             # Sort by points (highest to lowest), filter out zero points
             sorted_results = sorted(
@@ -400,45 +495,24 @@ def main():
     st.header("❓ FAQ")
     
     with st.expander("🧠 How the calculation works"):
-        if current_positions:
-            vote_result = VoteResult(current_positions)
-            sorted_results = vote_result.get_sorted_results()
-            st.write("**Current positions and territories:**")
-            
-            for i, (option, position, share) in enumerate(sorted_results):
-                left_boundary = 0.0
-                right_boundary = 100.0
-                
-                if i > 0:
-                    prev_pos = sorted_results[i-1][1]
-                    left_boundary = (prev_pos + position) / 2.0
-                
-                if i < len(sorted_results) - 1:
-                    next_pos = sorted_results[i+1][1]
-                    right_boundary = (position + next_pos) / 2.0
+        # Expanders render their body even when collapsed, so the breakdown
+        # is only computed once the reader asks for it
+        if st.toggle("Show territories for my current positions", key="_show_territories"):
+            if current_positions:
+                vote_result, _ = _get_preview(current_positions)
+                st.write("**Current positions and territories:**")
                 
-                st.write(f"- **{option}** at position {position:.1f} → "
-                       f"territory {left_boundary:.1f}–{right_boundary:.1f} = **{share:.1f}%**")
-        else:
-            st.write("Select options above to see territory calculations.")
+                # One markdown element for the whole list instead of one per option
+                st.markdown("\n".join(
+                    f"- **{option}** at position {position:.1f} → "
+                    f"territory {left_boundary:.1f}–{right_boundary:.1f} = **{share:.1f}%**"
+                    for option, position, left_boundary, right_boundary, share in vote_result.get_territories()
+                ))
+            else:
+                st.write("Select options above to see territory calculations.")
     
     with st.expander("ℹ️ How to use this voting system"):
-        st.markdown("""
-        ### Voting Process:
-        1. **Select options** using checkboxes
-        2. **Set positions** using sliders (0-100 scale)
-        3. **Watch** the distribution update automatically above
-        
-        ### How shares are calculated:
-        - Each option controls territory based on **midpoints** between adjacent positions
-        - This creates a **1D Voronoi diagram** on the 0-100 bar
-        - Single option → gets 100%
-        - Multiple options → territory boundaries at midpoints
-        
-        ### Examples:
-        - Two options at 30 and 70 → midpoint at 50 → 50% each
-        - Three options at 20, 50, 80 → boundaries at 35 and 65 → 35%, 30%, 35%
-        """)
+        st.markdown(_FAQ_HOWTO_MD)
 
 
 if __name__ == "__main__":
@@ -10,12 +10,64 @@ Tables:
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
-from sqlalchemy import create_engine, Column, String, DateTime, JSON, PrimaryKeyConstraint
-from sqlalchemy.orm import declarative_base, sessionmaker, Session
+from typing import Any, Dict, List, Optional, cast
+from sqlalchemy import bindparam, create_engine, delete, event, exists, select, text, update, Column, String, DateTime, JSON, PrimaryKeyConstraint
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.orm import declarative_base, relationship, selectinload, sessionmaker, Session
 
 Base = declarative_base()
 
+# Applied to every new SQLite connection: WAL lets readers and a writer work
+# concurrently, and busy_timeout waits out short locks instead of failing
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+# Sums every participant's 1D Voronoi shares per option inside SQLite: json_each
+# unpacks each vote, and LAG/LEAD over the participant's positions (ties broken by
+# key order, as in the Python implementation) give the territory boundaries
+_AGGREGATE_RESULTS_SQL = text("""
+    WITH entries AS (
+        SELECT votes.participant_id AS participant,
+               entry.key AS option,
+               CAST(entry.value AS REAL) AS position,
+               entry.id AS seq
+        FROM votes, json_each(votes.positions) AS entry
+        WHERE votes.room_code = :room_code
+    ),
+    territories AS (
+        SELECT option,
+               COALESCE((position + LEAD(position) OVER neighbours) / 2.0, 100.0)
+               - COALESCE((LAG(position) OVER neighbours + position) / 2.0, 0.0) AS share
+        FROM entries
+        WINDOW neighbours AS (PARTITION BY participant ORDER BY position, seq)
+    )
+    SELECT option, SUM(share) AS points
+    FROM territories
+    GROUP BY option
+""")
+
+
+def _dump_json(value) -> str:
+    """Serialize JSON columns compactly; the stored text is never read by people."""
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Configure a freshly opened SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
 
 class Room(Base):
     """Room table storing room metadata and available options."""
@@ -24,7 +76,15 @@ class Room(Base):
     room_code = Column(String(6), primary_key=True, index=True)
     available_options = Column(JSON, nullable=False)  # List of option strings
     created_at = Column(DateTime, nullable=False, default=datetime.now)
-    last_updated = Column(DateTime, nullable=False, default=datetime.now, onupdate=datetime.now)
+    # Indexed so cleanup_old_rooms' cutoff filter is a range scan
+    last_updated = Column(DateTime, nullable=False, default=datetime.now, onupdate=datetime.now, index=True)
+    
+    # Read-only link to the room's votes (the schema has no foreign key to follow)
+    votes = relationship(
+        "Vote",
+        primaryjoin="Room.room_code == foreign(Vote.room_code)",
+        viewonly=True
+    )
     
     def __repr__(self):
         return f"<Room(code={self.room_code}, options={len(self.available_options)}, updated={self.last_updated})>"
@@ -37,9 +97,11 @@ class Vote(Base):
     room_code = Column(String(6), nullable=False)
     participant_id = Column(String(36), nullable=False)  # UUID
     positions = Column(JSON, nullable=False)  # Dict[str, float] - option -> position
-    submitted_at = Column(DateTime, nullable=False, default=datetime.now, onupdate=datetime.now)
+    # Set explicitly by the vote upsert, so no onupdate hook is needed
+    submitted_at = Column(DateTime, nullable=False, default=datetime.now)
     
-    # Composite primary key: one vote per participant per room
+    # Composite primary key: one vote per participant per room. Its room_code
+    # prefix already serves per-room lookups, so no separate index is needed
     __table_args__ = (
         PrimaryKeyConstraint('room_code', 'participant_id'),
     )
@@ -48,6 +110,29 @@ class Vote(Base):
         return f"<Vote(room={self.room_code}, participant={self.participant_id[:8]}..., options={len(self.positions)})>"
 
 
+# Hot read statements are built once at import; the engine's compiled cache then
+# serves every execution, leaving only parameter binding per call
+_ROOM_EXISTS_STMT = select(exists().where(Room.room_code == bindparam("room_code")))
+_PARTICIPANT_VOTE_STMT = select(Vote.positions).where(
+    Vote.room_code == bindparam("room_code"),
+    Vote.participant_id == bindparam("participant_id")
+)
+_ROOM_VOTES_STMT = select(Vote.participant_id, Vote.positions).where(
+    Vote.room_code == bindparam("room_code")
+)
+
+
+def _room_to_dict(room: Room, votes: List[Vote]) -> Dict:
+    """Convert a room and its votes to the plain dict returned by Database."""
+    return {
+        'room_code': room.room_code,
+        'available_options': room.available_options,
+        'created_at': room.created_at,
+        'last_updated': room.last_updated,
+        'participant_votes': {vote.participant_id: vote.positions for vote in votes}
+    }
+
+
 class Database:
     """Database manager for vote-bar SQLite operations."""
     
@@ -56,15 +141,26 @@ class Database:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
+        in_memory = str(db_path) == ":memory:"
+        
         # Create engine with connection pooling
         self.engine = create_engine(
             f"sqlite:///{self.db_path}",
             echo=False,  # Set to True for SQL debugging
-            connect_args={"check_same_thread": False}  # Allow multi-threaded access
+            connect_args={"check_same_thread": False},  # Allow multi-threaded access
+            json_serializer=_dump_json
         )
         
+        # WAL needs a database file; in-memory databases keep SQLite's defaults
+        if not in_memory:
+            event.listen(self.engine, "connect", _set_sqlite_pragmas)
+        
         # Create tables if they don't exist
         Base.metadata.create_all(self.engine)
+        # create_all leaves existing tables alone, so add any indexes they lack
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
         
         # Session factory
         self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False)
@@ -88,16 +184,13 @@ class Database:
         cutoff = datetime.now() - timedelta(hours=hours)
         session = self.get_session()
         try:
-            # Delete old votes first (foreign key constraint)
-            old_rooms = session.query(Room).filter(Room.last_updated < cutoff).all()
-            old_room_codes = [room.room_code for room in old_rooms]
-            
-            if old_room_codes:
-                session.query(Vote).filter(Vote.room_code.in_(old_room_codes)).delete(synchronize_session=False)
-                deleted_count = session.query(Room).filter(Room.room_code.in_(old_room_codes)).delete(synchronize_session=False)
-                session.commit()
-                return deleted_count
-            return 0
+            # Delete old votes first (foreign key constraint), selecting the rooms in SQL
+            old_room_codes = select(Room.room_code).where(Room.last_updated < cutoff)
+            session.execute(delete(Vote).where(Vote.room_code.in_(old_room_codes)))
+            deleted = cast(CursorResult[Any], session.execute(delete(Room).where(Room.last_updated < cutoff)))
+            deleted_count = deleted.rowcount
+            session.commit()
+            return deleted_count
         finally:
             session.close()
     
@@ -106,11 +199,13 @@ class Database:
         """Create a new room."""
         session = self.get_session()
         try:
+            # One clock read: a fresh room was created and last updated at the same instant
+            now = datetime.now()
             room = Room(
                 room_code=room_code,
                 available_options=available_options,
-                created_at=datetime.now(),
-                last_updated=datetime.now()
+                created_at=now,
+                last_updated=now
             )
             session.add(room)
             session.commit()
@@ -125,24 +220,17 @@ class Database:
         """Get room data by code."""
         session = self.get_session()
         try:
-            room = session.query(Room).filter(Room.room_code == room_code).first()
-            if not room:
+            # One query: the room joined with its votes (None when it has no votes)
+            rows = (
+                session.query(Room, Vote)
+                .outerjoin(Vote, Vote.room_code == Room.room_code)
+                .filter(Room.room_code == room_code)
+                .all()
+            )
+            if not rows:
                 return None
             
-            # Get all votes for this room
-            votes = session.query(Vote).filter(Vote.room_code == room_code).all()
-            participant_votes = {
-                vote.participant_id: vote.positions 
-                for vote in votes
-            }
-            
-            return {
-                'room_code': room.room_code,
-                'available_options': room.available_options,
-                'created_at': room.created_at,
-                'last_updated': room.last_updated,
-                'participant_votes': participant_votes
-            }
+            return _room_to_dict(rows[0][0], [vote for _, vote in rows if vote is not None])
         finally:
             session.close()
     
@@ -150,7 +238,8 @@ class Database:
         """Check if a room exists."""
         session = self.get_session()
         try:
-            return session.query(Room).filter(Room.room_code == room_code).count() > 0
+            # EXISTS stops at the first match instead of counting rows
+            return session.execute(_ROOM_EXISTS_STMT, {"room_code": room_code}).scalar_one()
         finally:
             session.close()
     
@@ -192,57 +281,49 @@ class Database:
         """Get all rooms (for testing/debugging)."""
         session = self.get_session()
         try:
-            rooms = session.query(Room).all()
-            result = []
-            for room in rooms:
-                votes = session.query(Vote).filter(Vote.room_code == room.room_code).all()
-                participant_votes = {
-                    vote.participant_id: vote.positions 
-                    for vote in votes
-                }
-                result.append({
-                    'room_code': room.room_code,
-                    'available_options': room.available_options,
-                    'created_at': room.created_at,
-                    'last_updated': room.last_updated,
-                    'participant_votes': participant_votes
-                })
-            return result
+            # Votes for every room arrive in a single extra SELECT ... IN query
+            rooms = session.query(Room).options(selectinload(Room.votes)).all()
+            return [_room_to_dict(room, room.votes) for room in rooms]
         finally:
             session.close()
     
     # Vote operations
     def submit_vote(self, room_code: str, participant_id: str, positions: Dict[str, float]) -> bool:
         """Submit or update a participant's vote in a room."""
+        return self.bulk_submit_votes(room_code, {participant_id: positions})
+    
+    def bulk_submit_votes(self, room_code: str, votes: Dict[str, Dict[str, float]]) -> bool:
+        """Submit or update several participants' votes in a room with a single INSERT."""
+        if not votes:
+            return self.room_exists(room_code)
+        
         session = self.get_session()
         try:
-            # First check if room exists
-            room = session.query(Room).filter(Room.room_code == room_code).first()
-            if not room:
-                return False
-            
-            # Check if vote already exists
-            existing_vote = session.query(Vote).filter(
-                Vote.room_code == room_code,
-                Vote.participant_id == participant_id
-            ).first()
+            now = datetime.now()
             
-            if existing_vote:
-                # Update existing vote
-                existing_vote.positions = positions
-                existing_vote.submitted_at = datetime.now()
-            else:
-                # Create new vote
-                vote = Vote(
-                    room_code=room_code,
-                    participant_id=participant_id,
-                    positions=positions,
-                    submitted_at=datetime.now()
-                )
-                session.add(vote)
+            # Touching the room first both checks it exists and takes the write lock
+            # DML statements return a CursorResult, which carries the rowcount
+            touched = cast(CursorResult[Any], session.execute(
+                update(Room).where(Room.room_code == room_code).values(last_updated=now)
+            ))
+            if not touched.rowcount:
+                session.rollback()
+                return False
             
-            # Update room's last_updated timestamp
-            room.last_updated = datetime.now()
+            # Insert the votes, or replace the participants' previous ones, in one statement
+            stmt = sqlite_insert(Vote).values([
+                {
+                    'room_code': room_code,
+                    'participant_id': participant_id,
+                    'positions': positions,
+                    'submitted_at': now
+                }
+                for participant_id, positions in votes.items()
+            ])
+            session.execute(stmt.on_conflict_do_update(
+                index_elements=[Vote.room_code, Vote.participant_id],
+                set_={'positions': stmt.excluded.positions, 'submitted_at': stmt.excluded.submitted_at}
+            ))
             
             session.commit()
             return True
@@ -256,11 +337,11 @@ class Database:
         """Get a specific participant's vote in a room."""
         session = self.get_session()
         try:
-            vote = session.query(Vote).filter(
-                Vote.room_code == room_code,
-                Vote.participant_id == participant_id
-            ).first()
-            return vote.positions if vote else None
+            # Read the column directly; no Vote instance is needed
+            return session.execute(
+                _PARTICIPANT_VOTE_STMT,
+                {"room_code": room_code, "participant_id": participant_id}
+            ).scalar_one_or_none()
         finally:
             session.close()
     
@@ -268,8 +349,17 @@ class Database:
         """Get all votes for a room."""
         session = self.get_session()
         try:
-            votes = session.query(Vote).filter(Vote.room_code == room_code).all()
-            return {vote.participant_id: vote.positions for vote in votes}
+            rows = session.execute(_ROOM_VOTES_STMT, {"room_code": room_code})
+            return {participant_id: positions for participant_id, positions in rows}
+        finally:
+            session.close()
+    
+    def get_aggregated_results(self, room_code: str) -> Dict[str, float]:
+        """Get each option's total vote share across all participants in a room."""
+        session = self.get_session()
+        try:
+            rows = session.execute(_AGGREGATE_RESULTS_SQL, {"room_code": room_code})
+            return {option: points for option, points in rows}
         finally:
             session.close()
     
@@ -5,16 +5,18 @@ Handles room creation, joining, and shared state management.
 Uses SQLite database for persistence.
 """
 
-import random
-import string
+import base64
+import secrets
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from dataclasses import dataclass, field
 
 from .database import get_database
+from .vote_logic import compute_vote_shares
 
 
-@dataclass
+@dataclass(slots=True)
 class RoomState:
     """Represents the state of a voting room (in-memory representation)."""
     
@@ -23,6 +25,10 @@ class RoomState:
     participant_votes: Dict[str, Dict[str, float]] = field(default_factory=dict)  # participant_id -> {option: position}
     created_at: datetime = field(default_factory=datetime.now)
     last_updated: datetime = field(default_factory=datetime.now)
+    # participant_id -> (positions the shares were computed from, shares)
+    _shares_cache: Dict[str, Tuple[Dict[str, float], Dict[str, float]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
     
     @property
     def participant_count(self) -> int:
@@ -30,10 +36,25 @@ class RoomState:
         return len(self.participant_votes)
     
     def submit_vote(self, participant_id: str, positions: Dict[str, float]) -> None:
-        """Submit a vote from a participant."""
-        self.participant_votes[participant_id] = positions.copy()
+        """Submit a vote from a participant.
+        
+        The positions dict is stored as-is; callers hand over a fresh dict and
+        must not mutate it afterwards.
+        """
+        self.participant_votes[participant_id] = positions
+        self._shares_cache[participant_id] = (positions, compute_vote_shares(positions))
         self.last_updated = datetime.now()
     
+    def _participant_shares(self, participant_id: str, positions: Dict[str, float]) -> Dict[str, float]:
+        """Return a participant's Voronoi shares, recomputing only when their vote was replaced."""
+        cached = self._shares_cache.get(participant_id)
+        # Stored votes are never mutated, so an identical dict means identical shares
+        if cached is not None and cached[0] is positions:
+            return cached[1]
+        shares = compute_vote_shares(positions)
+        self._shares_cache[participant_id] = (positions, shares)
+        return shares
+    
     def get_aggregated_results(self) -> Dict[str, float]:
         """
         Aggregate all participant votes to calculate total points for each option.
@@ -43,21 +64,14 @@ class RoomState:
         if not self.participant_votes:
             return {}
         
-        # Count votes for each option
-        option_points: Dict[str, float] = {}
+        # Sum each participant's cached shares per option
+        option_points: Dict[str, float] = defaultdict(float)
         
         for participant_id, positions in self.participant_votes.items():
-            # Calculate vote shares for this participant using Voronoi logic
-            from logic.vote_logic import VoteResult
-            vote_result = VoteResult(positions)
-            
-            # Add this participant's share to the total
-            for option, share in vote_result.shares.items():
-                if option not in option_points:
-                    option_points[option] = 0.0
+            for option, share in self._participant_shares(participant_id, positions).items():
                 option_points[option] += share
         
-        return option_points
+        return dict(option_points)
     
     def update_options(self, options: List[str]) -> None:
         """Update the list of available options."""
@@ -84,8 +98,10 @@ class RoomManager:
     
     def generate_room_code(self, length: int = 6) -> str:
         """Generate a unique room code."""
+        # Base32 packs 5 random bits per character (A-Z, 2-7), drawn in a single call
+        n_bytes = (length * 5 + 7) // 8
         while True:
-            code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=length))
+            code = base64.b32encode(secrets.token_bytes(n_bytes)).decode('ascii')[:length]
             if not self.db.room_exists(code):
                 return code
     
@@ -184,6 +200,19 @@ class RoomManager:
         room_code = room_code.upper().strip()
         return self.db.submit_vote(room_code, participant_id, positions)
     
+    def get_aggregated_results(self, room_code: str) -> Dict[str, float]:
+        """
+        Aggregate a room's votes in the database.
+        
+        Args:
+            room_code: The room code
+            
+        Returns:
+            Dict of {option: total_points}, empty if the room has no votes
+        """
+        room_code = room_code.upper().strip()
+        return self.db.get_aggregated_results(room_code)
+    
     def room_exists(self, room_code: str) -> bool:
         """Check if a room exists."""
         return self.db.room_exists(room_code.upper().strip())
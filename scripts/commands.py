@@ -0,0 +1,14 @@
+# Shared helpers for the vote-bar development scripts
+# Imported by dev.py and docker.py (their directory is on sys.path when run)
+
+import os
+import sys
+import subprocess
+
+def exec_command(args):
+    """Replace this process with the given command (single-step commands only)."""
+    sys.stdout.flush()
+    if os.name == "nt":
+        # Windows has no real exec: os.execvp spawns a child and exits immediately
+        sys.exit(subprocess.run(args).returncode)
+    os.execvp(args[0], args)
@@ -4,15 +4,17 @@
 import sys
 import subprocess
 
+from commands import exec_command
+
 def run_tests():
     """Run pytest with coverage."""
     print("🧪 Running tests with coverage...")
-    subprocess.run(["uv", "run", "pytest"], check=True)
+    exec_command(["uv", "run", "pytest"])
 
 def run_app():
     """Start the Streamlit application."""
     print("🚀 Starting Streamlit app...")
-    subprocess.run(["uv", "run", "streamlit", "run", "app.py"], check=True)
+    exec_command(["uv", "run", "streamlit", "run", "app.py"])
 
 def format_code():
     """Format code with black and isort."""
@@ -23,10 +25,15 @@ def format_code():
 
 def lint_code():
     """Lint code with flake8 and mypy."""
-    print("🔍 Linting with flake8...")
-    subprocess.run(["uv", "run", "flake8", "."], check=True)
-    print("🔬 Type checking with mypy...")
-    subprocess.run(["uv", "run", "mypy", "logic/", "app.py"], check=True)
+    # Both tools only read the tree, so they run side by side
+    print("🔍 Linting with flake8 and 🔬 type checking with mypy...")
+    procs = [
+        subprocess.Popen(["uv", "run", "flake8", "."]),
+        subprocess.Popen(["uv", "run", "mypy", "logic/", "app.py"]),
+    ]
+    returncodes = [proc.wait() for proc in procs]
+    if any(returncodes):
+        sys.exit(max(returncodes))
 
 def main():
     commands = {
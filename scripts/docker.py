@@ -4,25 +4,27 @@
 import sys
 import subprocess
 
+from commands import exec_command
+
 def build_dev():
     """Build development Docker image."""
     print("🐳 Building development Docker image...")
-    subprocess.run([
+    exec_command([
         "docker", "build", 
         "--target", "development",
         "-t", "vote-bar:dev", 
         "."
-    ], check=True)
+    ])
 
 def build_prod():
     """Build production Docker image."""
     print("🐳 Building production Docker image...")
-    subprocess.run([
+    exec_command([
         "docker", "build", 
         "--target", "production",
         "-t", "vote-bar:prod", 
         "."
-    ], check=True)
+    ])
 
 def up():
     """Start the development environment with docker-compose."""
@@ -33,35 +35,35 @@ def up():
 def down():
     """Stop the development environment."""
     print("🛑 Stopping development environment...")
-    subprocess.run(["docker-compose", "down"], check=True)
+    exec_command(["docker-compose", "down"])
 
 def logs():
     """Show logs from the running container."""
     print("📋 Showing container logs...")
-    subprocess.run(["docker-compose", "logs", "-f", "vote-bar"], check=True)
+    exec_command(["docker-compose", "logs", "-f", "vote-bar"])
 
 def test():
     """Run tests in Docker container."""
     print("🧪 Running tests in Docker...")
-    subprocess.run([
+    exec_command([
         "docker-compose", "--profile", "testing", 
         "run", "--rm", "test"
-    ], check=True)
+    ])
 
 def lint():
     """Run code quality checks in Docker container."""
     print("🔍 Running code quality checks in Docker...")
-    subprocess.run([
+    exec_command([
         "docker-compose", "--profile", "quality", 
         "run", "--rm", "lint"
-    ], check=True)
+    ])
 
 def shell():
     """Open shell in running container."""
     print("🐚 Opening shell in vote-bar container...")
-    subprocess.run([
+    exec_command([
         "docker-compose", "exec", "vote-bar", "/bin/bash"
-    ], check=True)
+    ])
 
 def main():
     commands = {
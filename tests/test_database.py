@@ -4,8 +4,6 @@ Unit tests for the Database layer.
 
 import pytest
 import tempfile
-import gc
-import time
 import shutil
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -15,24 +13,13 @@ from logic.database import Database, get_database, Room, Vote
 @pytest.fixture
 def temp_db():
     """Fixture providing a temporary database."""
-    tmpdir = tempfile.mkdtemp()
-    db_path = str(Path(tmpdir) / "test.db")
-    db = Database(db_path)
-    
-    yield db
-    
-    # Cleanup
-    try:
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmpdir:
+        db = Database(str(Path(tmpdir) / "test.db"))
+        
+        yield db
+        
+        # Cleanup: disposing the engine closes every pooled connection
         db.close()
-        gc.collect()
-        time.sleep(0.1)
-    except Exception:
-        pass
-    
-    try:
-        shutil.rmtree(tmpdir, ignore_errors=True)
-    except Exception:
-        pass
 
 
 class TestDatabase:
@@ -68,6 +55,7 @@ class TestDatabase:
         assert room is not None
         assert room['room_code'] == "TEST01"
         assert room['available_options'] == ["Option A", "Option B"]
+        assert room['created_at'] == room['last_updated']
     
     def test_create_duplicate_room(self, temp_db):
         """Test creating a room with duplicate code fails."""
@@ -125,6 +113,28 @@ class TestDatabase:
         room = temp_db.get_room("TEST01")
         assert room['participant_votes']["participant-1"] == new_positions
     
+    def test_bulk_submit_votes(self, temp_db):
+        """Test submitting several votes at once inserts and updates them."""
+        temp_db.create_room("BULK01", ["Option A", "Option B"])
+        temp_db.submit_vote("BULK01", "p1", {"Option A": 10.0})
+        
+        success = temp_db.bulk_submit_votes("BULK01", {
+            "p1": {"Option A": 40.0, "Option B": 60.0},
+            "p2": {"Option B": 30.0},
+        })
+        
+        assert success is True
+        assert temp_db.get_all_votes("BULK01") == {
+            "p1": {"Option A": 40.0, "Option B": 60.0},
+            "p2": {"Option B": 30.0},
+        }
+    
+    def test_bulk_submit_votes_nonexistent_room(self, temp_db):
+        """Test bulk submission into a missing room stores nothing."""
+        assert temp_db.bulk_submit_votes("NOROOM", {"p1": {"Option A": 50.0}}) is False
+        assert temp_db.bulk_submit_votes("NOROOM", {}) is False
+        assert temp_db.get_all_votes("NOROOM") == {}
+    
     def test_get_all_rooms(self, temp_db):
         """Test getting all rooms."""
         temp_db.create_room("TEST01", ["Option A"])
@@ -162,8 +172,9 @@ class TestDatabase:
         deleted_count = temp_db.cleanup_old_rooms(hours=24)
         assert deleted_count == 1
         
-        # Verify old room is gone
+        # Verify old room and its votes are gone
         assert temp_db.get_room("OLD01") is None
+        assert temp_db.get_all_votes("OLD01") == {}
         # Verify new room still exists
         assert temp_db.get_room("NEW01") is not None
     
@@ -178,8 +189,10 @@ class TestDatabase:
     def test_delete_participant_vote(self, temp_db):
         """Test deleting a participant's vote."""
         temp_db.create_room("TEST01", ["Option A", "Option B"])
-        temp_db.submit_vote("TEST01", "participant-1", {"Option A": 0.5, "Option B": 0.5})
-        temp_db.submit_vote("TEST01", "participant-2", {"Option A": 0.3, "Option B": 0.7})
+        temp_db.bulk_submit_votes("TEST01", {
+            "participant-1": {"Option A": 0.5, "Option B": 0.5},
+            "participant-2": {"Option A": 0.3, "Option B": 0.7},
+        })
         
         # Delete participant-1's vote
         success = temp_db.delete_participant_vote("TEST01", "participant-1")
@@ -199,9 +212,11 @@ class TestDatabase:
     def test_room_with_multiple_votes(self, temp_db):
         """Test room correctly aggregates multiple participant votes."""
         temp_db.create_room("TEST01", ["Option A", "Option B", "Option C"])
-        temp_db.submit_vote("TEST01", "p1", {"Option A": 0.2, "Option B": 0.5, "Option C": 0.3})
-        temp_db.submit_vote("TEST01", "p2", {"Option A": 0.8, "Option B": 0.1, "Option C": 0.1})
-        temp_db.submit_vote("TEST01", "p3", {"Option A": 0.5, "Option B": 0.3, "Option C": 0.2})
+        temp_db.bulk_submit_votes("TEST01", {
+            "p1": {"Option A": 0.2, "Option B": 0.5, "Option C": 0.3},
+            "p2": {"Option A": 0.8, "Option B": 0.1, "Option C": 0.1},
+            "p3": {"Option A": 0.5, "Option B": 0.3, "Option C": 0.2},
+        })
         
         room = temp_db.get_room("TEST01")
         assert len(room['participant_votes']) == 3
@@ -334,6 +349,42 @@ class TestDatabaseErrorHandling:
         assert "p1" in all_votes
         assert "p2" in all_votes
     
+    def test_wal_mode_enabled(self, temp_db):
+        """Test file databases use WAL journaling with a busy timeout."""
+        with temp_db.engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+    
+    def test_last_updated_index(self, temp_db):
+        """Test rooms are indexed by last update for cleanup."""
+        from sqlalchemy import inspect
+        indexes = inspect(temp_db.engine).get_indexes('rooms')
+        assert any(index['column_names'] == ['last_updated'] for index in indexes)
+    
+    def test_json_columns_stored_compactly(self, temp_db):
+        """Test JSON columns are written without separator whitespace."""
+        temp_db.create_room("JSON01", ["Option A", "Option B"])
+        temp_db.submit_vote("JSON01", "p1", {"Option A": 25.0, "Option B": 75.0})
+        
+        with temp_db.engine.connect() as conn:
+            options = conn.exec_driver_sql("SELECT available_options FROM rooms").scalar()
+            positions = conn.exec_driver_sql("SELECT positions FROM votes").scalar()
+        
+        assert options == '["Option A","Option B"]'
+        assert positions == '{"Option A":25.0,"Option B":75.0}'
+        assert temp_db.get_participant_vote("JSON01", "p1") == {"Option A": 25.0, "Option B": 75.0}
+    
+    def test_in_memory_database_skips_wal(self):
+        """Test in-memory databases keep SQLite's default journal mode."""
+        db = Database(":memory:")
+        try:
+            with db.engine.connect() as conn:
+                assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "memory"
+            assert db.create_room("MEM001", ["A", "B"])
+            assert db.room_exists("MEM001")
+        finally:
+            db.close()
+    
     def test_close_handles_errors_gracefully(self):
         """Test close() handles errors when pool doesn't exist."""
         tmpdir = tempfile.mkdtemp()
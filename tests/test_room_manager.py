@@ -4,8 +4,7 @@ Unit tests for room management functionality with SQLite backend.
 
 import pytest
 import tempfile
-import gc
-import time
+import pickle
 from pathlib import Path
 from datetime import datetime, timedelta
 from logic.room_manager import RoomManager, RoomState
@@ -14,35 +13,14 @@ from logic.room_manager import RoomManager, RoomState
 @pytest.fixture
 def temp_manager():
     """Fixture providing a RoomManager with temporary database."""
-    tmpdir = tempfile.mkdtemp()
-    db_path = str(Path(tmpdir) / "test.db")
-    manager = RoomManager(db_path=db_path)
-    
-    yield manager
-    
-    # Clean up: close all database connections
-    try:
+    # ignore_cleanup_errors: Windows may still hold a lock on the file; removal is best effort
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmpdir:
+        manager = RoomManager(db_path=str(Path(tmpdir) / "test.db"))
+        
+        yield manager
+        
+        # Disposing the engine closes every pooled connection, releasing the file
         manager.db.close()
-        # Force garbage collection to release file handles
-        gc.collect()
-        time.sleep(0.15)  # Increased delay for Windows
-    except Exception:
-        pass  # Ignore cleanup errors
-    
-    # Force new instance for next test
-    try:
-        from logic.database import get_database
-        get_database(db_path, force_new=True)
-    except Exception:
-        pass
-    
-    # Try to clean up temp directory (best effort on Windows)
-    try:
-        import shutil
-        time.sleep(0.1)
-        shutil.rmtree(tmpdir, ignore_errors=True)
-    except Exception:
-        pass  # Windows may still have file locks
 
 
 class TestRoomManager:
@@ -148,9 +126,7 @@ class TestRoomManager:
     
     def test_cleanup_old_rooms(self):
         """Test cleaning up old inactive rooms."""
-        import shutil
-        tmpdir = tempfile.mkdtemp()
-        try:
+        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmpdir:
             db_path = str(Path(tmpdir) / "test.db")
             manager = RoomManager(db_path=db_path)
             
@@ -178,14 +154,6 @@ class TestRoomManager:
             # Clean up database connections
             manager.db.close()
             db.close()
-            gc.collect()
-            time.sleep(0.2)
-        finally:
-            # Best effort cleanup
-            try:
-                shutil.rmtree(tmpdir, ignore_errors=True)
-            except Exception:
-                pass
     
     def test_cleanup_no_old_rooms(self, temp_manager):
         """Test cleanup when no rooms are old enough."""
@@ -269,6 +237,24 @@ class TestRoomState:
         assert results['B'] > 0
         assert state.participant_count == 2
     
+    def test_aggregated_results_follow_vote_changes(self):
+        """Test cached shares are recomputed when a stored vote changes."""
+        state = RoomState(room_id="TEST")
+        state.submit_vote("p1", {'A': 30.0, 'B': 70.0})
+        assert state.get_aggregated_results() == {'A': 50.0, 'B': 50.0}
+        
+        # Replacing the stored vote directly must not reuse the cached shares
+        state.participant_votes["p1"] = {'A': 10.0, 'B': 20.0, 'C': 90.0}
+        assert state.get_aggregated_results() == {'A': 15.0, 'B': 40.0, 'C': 45.0}
+    
+    def test_room_state_uses_slots(self):
+        """Test RoomState has no per-instance __dict__ and still pickles (st.cache_data)."""
+        state = RoomState(room_id="TEST", available_options=['A', 'B'])
+        state.submit_vote("p1", {'A': 30.0, 'B': 70.0})
+        
+        assert not hasattr(state, '__dict__')
+        assert pickle.loads(pickle.dumps(state)) == state
+    
     def test_update_options(self):
         """Test updating options in room state."""
         state = RoomState(room_id="TEST")
@@ -4,8 +4,6 @@ Tests for multi-participant vote aggregation.
 
 import pytest
 import tempfile
-import gc
-import time
 from pathlib import Path
 from logic.room_manager import RoomManager, RoomState
 
@@ -13,35 +11,14 @@ from logic.room_manager import RoomManager, RoomState
 @pytest.fixture
 def temp_manager():
     """Fixture providing a RoomManager with temporary database."""
-    tmpdir = tempfile.mkdtemp()
-    db_path = str(Path(tmpdir) / "test.db")
-    manager = RoomManager(db_path=db_path)
-    
-    yield manager
-    
-    # Clean up: close all database connections
-    try:
+    # ignore_cleanup_errors: Windows may still hold a lock on the file; removal is best effort
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmpdir:
+        manager = RoomManager(db_path=str(Path(tmpdir) / "test.db"))
+        
+        yield manager
+        
+        # Disposing the engine closes every pooled connection, releasing the file
         manager.db.close()
-        # Force garbage collection to release file handles
-        gc.collect()
-        time.sleep(0.15)  # Increased delay for Windows
-    except Exception:
-        pass  # Ignore cleanup errors
-    
-    # Force new instance for next test
-    try:
-        from logic.database import get_database
-        get_database(db_path, force_new=True)
-    except Exception:
-        pass
-    
-    # Try to clean up temp directory (best effort on Windows)
-    try:
-        import shutil
-        time.sleep(0.1)
-        shutil.rmtree(tmpdir, ignore_errors=True)
-    except Exception:
-        pass  # Windows may still have file locks
 
 
 class TestVoteAggregation:
@@ -168,6 +145,28 @@ class TestVoteAggregation:
         assert abs(results['B'] - 100.0) < 0.1
         assert abs(results['C'] - 100.0) < 0.1
     
+    def test_database_aggregation_matches_room_state(self, temp_manager):
+        """Test the SQL aggregation agrees with the in-memory Voronoi aggregation."""
+        room_code = temp_manager.create_room(['A', 'B', 'C', 'D'])
+        
+        temp_manager.update_room_positions(room_code, "p1", {'A': 10.0, 'B': 20.0, 'C': 90.0})
+        temp_manager.update_room_positions(room_code, "p2", {'D': 50.0, 'A': 50.0})  # Tied positions
+        temp_manager.update_room_positions(room_code, "p3", {'C': 40.0})
+        
+        room = temp_manager.get_room(room_code)
+        expected = room.get_aggregated_results()
+        results = temp_manager.get_aggregated_results(room_code.lower())
+        
+        assert results.keys() == expected.keys()
+        for option, points in expected.items():
+            assert results[option] == pytest.approx(points)
+    
+    def test_database_aggregation_empty_room(self, temp_manager):
+        """Test the SQL aggregation of a room without votes is empty."""
+        room_code = temp_manager.create_room(['A', 'B'])
+        
+        assert temp_manager.get_aggregated_results(room_code) == {}
+    
     def test_nonexistent_room_update(self, temp_manager):
         """Test updating positions in a nonexistent room."""
         temp_manager = temp_manager
@@ -3,6 +3,7 @@ Unit tests for the simplified vote-bar logic.
 """
 
 import pytest
+from logic import vote_logic
 from logic.vote_logic import compute_vote_shares, VoteResult
 
 
@@ -33,6 +34,24 @@ class TestComputeVoteShares:
         result = compute_vote_shares({"A": 10.0, "B": 90.0})
         assert result == {"A": 50.0, "B": 50.0}  # Always 50/50 for two options
     
+    def test_two_options_off_centre(self):
+        """Test two options split the bar at their midpoint."""
+        assert compute_vote_shares({"A": 80.0, "B": 20.0}) == {"A": 50.0, "B": 50.0}
+        assert compute_vote_shares({"A": 70.0, "B": 10.0}) == {"A": 60.0, "B": 40.0}
+        assert compute_vote_shares({"A": 40.0, "B": 40.0}) == {"A": 40.0, "B": 60.0}
+    
+    def test_wide_vote_numpy_path_matches_sweep(self, monkeypatch):
+        """Test votes wide enough for the NumPy path split exactly like the Python sweep."""
+        positions = {f"O{i}": float((i * 37) % 101) for i in range(300)}  # includes ties
+        
+        result = compute_vote_shares(positions)
+        monkeypatch.setattr(vote_logic, "_NUMPY_MIN_OPTIONS", len(positions) + 1)
+        expected = compute_vote_shares(positions)
+        
+        assert list(result) == list(expected)
+        assert result == pytest.approx(expected)
+        assert VoteResult(positions).shares == pytest.approx(expected)
+    
     def test_three_options_even_spacing(self):
         """Test three options with even spacing."""
         result = compute_vote_shares({"A": 20.0, "B": 50.0, "C": 80.0})
@@ -101,6 +120,33 @@ class TestVoteResult:
         assert sorted_results[0][2] == 35.0  # A's share
         assert sorted_results[1][2] == 30.0  # B's share
         assert sorted_results[2][2] == 35.0  # C's share
+    
+    def test_empty_vote_result(self):
+        """Test an empty vote has no shares, results or territories."""
+        result = VoteResult({})
+        
+        assert result.shares == {}
+        assert result.get_sorted_results() == []
+        assert result.get_territories() == []
+    
+    def test_get_territories(self):
+        """Test territory boundaries sit at midpoints between neighbours."""
+        positions = {"C": 90.0, "A": 10.0, "B": 20.0}
+        result = VoteResult(positions)
+        
+        territories = result.get_territories()
+        
+        assert territories == [
+            ("A", 10.0, 0.0, 15.0, 15.0),
+            ("B", 20.0, 15.0, 55.0, 40.0),
+            ("C", 90.0, 55.0, 100.0, 45.0),
+        ]
+    
+    def test_get_territories_single_option(self):
+        """Test a single option spans the whole bar."""
+        result = VoteResult({"A": 25.0})
+        
+        assert result.get_territories() == [("A", 25.0, 0.0, 100.0, 100.0)]
 
 
 if __name__ == "__main__":